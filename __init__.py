@@ -1,19 +1,117 @@
+import collections
 import concurrent.futures
-from simple_salesforce import Salesforce
+import functools
+import hashlib
+import json
 import os
 import logging
-import yaml
-import requests
-import glob
+import mmap
 import threading
+import pickle
+import struct
+import time
 
+# yaml, glob, requests and simple_salesforce are imported on first use to keep importing
+# this module cheap for callers that only need part of it
     
 # Set SSL library log level to ERROR to reduce verbose output
 logging.getLogger('urllib3').setLevel(logging.ERROR)
 
 sf = None
 
-object_definitions = {}
+# PyYAML and the loader/dumper to use with it, set by _get_yaml
+_yaml = None
+_Loader = _Dumper = None
+_LIBYAML = False
+
+# shared HTTP session, see _get_session
+_session = None
+
+# (connect, read) timeouts in seconds for the OAuth token request
+AUTH_TIMEOUT = (5, 30)
+
+# SObject proxies by object name, see _get_sobject
+_sobjects = {}
+
+# Salesforce caps concurrent long-running requests per org at 25, stay comfortably below it
+DESCRIBE_WORKERS = 16
+
+# binary object definition cache, used when load_object_definitions is not given a cache_folder
+DEFAULT_CACHE_FOLDER = '~/.sf_cache'
+BINARY_CACHE_NAME = 'cache.pkl'
+CACHE_TTL = 24 * 60 * 60
+
+# maximum number of ids placed in a single SOQL IN clause
+REFERENCE_BATCH_SIZE = 200
+
+# SOQL allows at most five levels of parent relationship traversal
+MAX_RELATIONSHIP_DEPTH = 5
+
+# SOQL allows at most 55 parent relationships and 100,000 characters per query; the select
+# list is kept well under the latter to leave room for the WHERE clause
+MAX_RELATIONSHIPS = 55
+MAX_SELECT_LENGTH = 90000
+
+# bytes read per base64 block in upload_file, must be a multiple of 3
+UPLOAD_BLOCK_SIZE = 57 * 1024
+
+# maximum number of records per sObject Collections request
+COMPOSITE_BATCH_SIZE = 200
+
+# file extensions of the per-object definition files, by cache format
+CACHE_FORMATS = {'json': '.json', 'yaml': '.yaml'}
+
+# base name of the single file holding every cached object definition
+CONSOLIDATED_CACHE_NAME = 'objects'
+
+
+class _ObjectDefinitions(dict):
+    """
+    Object definitions by object name. Objects that have not been loaded are read from the
+    attached binary cache, if any, or described on first access through [], so
+    load_object_definitions is only needed to preload or to use cached definitions. get()
+    and 'in' also see the binary cache but never describe; iteration only sees loaded objects.
+    """
+
+    _cache = None
+
+    def attach_cache(self, cache):
+        self._cache = cache
+
+    def _from_cache(self, object_name):
+        if self._cache is None or object_name not in self._cache:
+            return None
+        fields = self[object_name] = self._cache.load(object_name)
+        return fields
+
+    def __missing__(self, object_name):
+        fields = self._from_cache(object_name)
+        if fields is None:
+            _, fields = _process_object(object_name)
+            if fields is None:
+                raise KeyError(object_name)
+            self[object_name] = fields
+        # nothing derived from other objects depends on this one, and misses are never cached
+        return fields
+
+    def __contains__(self, object_name):
+        return dict.__contains__(self, object_name) or (self._cache is not None and object_name in self._cache)
+
+    def get(self, object_name, default=None):
+        if dict.__contains__(self, object_name):
+            return dict.__getitem__(self, object_name)
+        fields = self._from_cache(object_name)
+        return default if fields is None else fields
+
+
+object_definitions = _ObjectDefinitions()
+
+# fields selected by get_object when the caller does not pass any, by object name,
+# e.g. default_fields['Account'] = ['Name']; Id is always selected as well
+default_fields = {}
+
+# 'SELECT ... FROM object' query prefixes built by get_object, see _clear_definition_caches
+_select_prefix = {}
 
 
 def split_into_batches(items, batch_size):
@@ -22,12 +120,59 @@ def split_into_batches(items, batch_size):
         yield full_list[i:i + batch_size]
 
 
+def _get_yaml():
+    """
+    Imports PyYAML on first use, selecting the LibYAML loader and dumper when available.
+    """
+    global _yaml, _Loader, _Dumper, _LIBYAML
+    if _yaml is None:
+        import yaml
+        try:
+            _Loader, _Dumper = yaml.CSafeLoader, yaml.CSafeDumper
+            _LIBYAML = True
+        except AttributeError:
+            _Loader, _Dumper = yaml.SafeLoader, yaml.SafeDumper
+            logging.warning("LibYAML bindings not available, falling back to the pure-Python YAML loader. "
+                            "Install libyaml and reinstall PyYAML for faster object definition caching.")
+        _yaml = yaml
+    return _yaml
+
+
+def _get_session():
+    """
+    Returns the HTTP session shared by the token request, the Salesforce client and file
+    downloads so they reuse pooled keep-alive connections, creating it on first use.
+    """
+    global _session
+    if _session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        # sized for the concurrent describe workers
+        adapter = HTTPAdapter(pool_connections=DESCRIBE_WORKERS, pool_maxsize=2 * DESCRIBE_WORKERS, max_retries=Retry(total=3, backoff_factor=0.3))
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        _session = session
+    return _session
+
+
+class SalesforceAuthError(Exception):
+    """
+    Raised when an access token cannot be obtained from SALESFORCE_TOKEN_URL.
+    """
+
+
 def get_client():
     """
     Returns a Salesforce client instance, creating one if it doesn't exist.
     
     Returns:
         Salesforce: Authenticated Salesforce client instance.
+
+    Raises:
+        SalesforceAuthError: If the token request fails or is rejected.
     """
     global sf
 
@@ -40,21 +185,29 @@ def get_client():
     }
 
     if sf is None:
-        resp = requests.post(url, data=auth_data).json()
+        import requests
+        from simple_salesforce import Salesforce
 
-        # Connect to Salesforce
+        session = _get_session()
         try:
-            if 'instance_url' not in resp:
-                logging.error(f"Error connecting to Salesforce: instance_url not in response")
-                logging.error(f"{resp}")
-                exit(1)
-            logging.debug(f"response received: {resp}")
-            sf = Salesforce(instance_url=resp['instance_url'], session_id=resp['access_token'])
-            logging.info("Connected to Salesforce successfully!")
-            return sf
-        except Exception as e:
-            logging.error(f"Error connecting to Salesforce [{resp['error']}]:{resp['error_description']}")
-            exit(1)
+            resp = session.post(url, data=auth_data, timeout=AUTH_TIMEOUT)
+        except requests.RequestException as e:
+            logging.error(f"Error requesting Salesforce access token: {e}")
+            raise SalesforceAuthError(f"Error requesting Salesforce access token: {e}") from e
+
+        try:
+            body = resp.json()
+        except ValueError:
+            body = {}
+
+        # Connect to Salesforce
+        if not resp.ok or 'instance_url' not in body:
+            error = f"[{body.get('error', resp.status_code)}]:{body.get('error_description', resp.reason)}"
+            logging.error(f"Error connecting to Salesforce {error}")
+            raise SalesforceAuthError(f"Error connecting to Salesforce {error}")
+        logging.debug(f"response received: {body}")
+        sf = Salesforce(instance_url=body['instance_url'], session_id=body['access_token'], session=session)
+        logging.info("Connected to Salesforce successfully!")
 
     return sf
 
@@ -74,25 +227,61 @@ def get_all_objects():
         return []
 
 
+def run_soql_query_iter(query):
+    """
+    Executes a SOQL query using query_all_iter, yielding records as each batch arrives instead
+    of holding the full result set in memory.
+
+    Args:
+        query (str): The SOQL query string.
+
+    Yields:
+        OrderedDict: Each record of the query results.
+
+    Raises:
+        Exception: Any error from Salesforce, including one while fetching a later batch, so a
+            failed query is never mistaken for a complete one.
+    """
+    svc = get_client()
+    yield from svc.query_all_iter(query)
+
+
 def run_soql_query(query):
     """
-    Executes a SOQL query using query_all and returns results as an OrderedDict.
+    Executes a SOQL query and returns all of the records.
 
     Args:
         query (str): The SOQL query string.
 
     Returns:
-        OrderedDict or None: Query results as an OrderedDict, or None if an error occurs.
+        list: Query results as a list of OrderedDicts, or an empty list if an error occurs.
     """
     try:
-        svc = get_client()
-        results = svc.query_all(query)
-        return results.get('records', [])
+        return list(run_soql_query_iter(query))
     except Exception as e:
         logging.error(f"Error running SOQL query: {e}")
         return []
 
 
+def _clear_definition_caches():
+    """
+    Clears the caches derived from object_definitions, call whenever it changes.
+    """
+    _references_for.cache_clear()
+    _sorted_fields.cache_clear()
+    _select_prefix.clear()
+
+
+def _get_sobject(object_name):
+    """
+    Returns the simple_salesforce SObject proxy for an object, reusing it across calls.
+    """
+    sobject = _sobjects.get(object_name)
+    if sobject is None:
+        sobject = _sobjects[object_name] = get_client().__getattr__(object_name)
+    return sobject
+
+
 def describe_object(object_name):
     """
     Retrieves the metadata description for a given Salesforce object.
@@ -104,36 +293,387 @@ def describe_object(object_name):
         dict: The metadata description of the object, or None if not found.
     """
     try:
-        sf = get_client()
-        return sf.__getattr__(object_name).describe()
+        return _get_sobject(object_name).describe()
     except Exception as e:
         logging.error(f"Error describing Salesforce object '{object_name}': {e}")
         return None
 
 
-def load_object_definitions(names=[], cache_folder=None, output=None):
+def _process_object(object_name):
+    """
+    Describes a Salesforce object and extracts the field metadata used by this module.
+
+    Args:
+        object_name (str): The API name of the Salesforce object.
+
+    Returns:
+        tuple: (object_name, fields) where fields is a dict of field names and their
+            definitions, or None if the describe failed.
+    """
+    obj_desc = describe_object(object_name)
+    if not obj_desc:
+        logging.error(f"Object '{object_name}' not found or description failed.")
+        return object_name, None
+
+    fields = {}
+    for f in obj_desc.get('fields', []):
+        get = f.get
+        name = get('name')
+        if name is None:
+            continue
+        reference_to = get('referenceTo')
+        picklist_values = get('picklistValues')
+        fields[name] = {
+            'name': name,
+            'label': get('label'),
+            'type': get('type'),
+            'reference': reference_to[0] if reference_to else None,
+            'polymorphic': len(reference_to or ()) > 1,
+            'relationship': get('relationshipName'),
+            'length': get('length'),
+            'picklistValues': [pv['value'] for pv in picklist_values] if picklist_values else []
+        }
+
+    logging.debug(f"loaded object definition for {object_name} with {len(fields)} fields")
+    return object_name, fields
+
+
+def _read_definitions(path):
+    """
+    Reads a consolidated definitions file mapping object names to their lists of fields.
+
+    Args:
+        path (str): Path to the JSON or YAML file.
+
+    Returns:
+        dict: Object names mapped to dicts of field names and their definitions.
+    """
+    if path.endswith('.json'):
+        with open(path, 'rb') as f:
+            objects = json.loads(f.read())
+    else:
+        with open(path, 'r') as f:
+            objects = _get_yaml().load(f, Loader=_Loader)
+    return {object_name: {field['name']: field for field in fields if 'name' in field}
+            for object_name, fields in (objects or {}).items()}
+
+
+def _write_definitions(path, objects, cache_format):
+    """
+    Writes object definitions to a consolidated file, merging them into any definitions
+    already in it. When the file does not exist yet, the definitions in the folder's other
+    consolidated file and per-object files are merged in, since once it exists the loader
+    reads nothing else. The file is replaced atomically so an interrupted write never loses
+    the definitions already saved.
+
+    Args:
+        path (str): Path to the JSON or YAML file.
+        objects (dict): Object names mapped to dicts of field names and their definitions.
+        cache_format (str): 'json' or 'yaml'.
+    """
+    if os.path.exists(path):
+        try:
+            objects = {**_read_definitions(path), **objects}
+        except Exception as e:
+            logging.warning(f"Overwriting unreadable definitions file {path}: {e}")
+    else:
+        folder = os.path.dirname(path)
+        existing = {}
+        for extension in CACHE_FORMATS.values():
+            other_path = os.path.join(folder, f"{CONSOLIDATED_CACHE_NAME}{extension}")
+            if other_path != path and os.path.exists(other_path):
+                try:
+                    existing.update(_read_definitions(other_path))
+                except Exception as e:
+                    logging.warning(f"Not merging unreadable definitions file {other_path}: {e}")
+        existing.update(_load_definition_files(folder, None, cache_format))
+        objects = {**existing, **objects}
+
+    data = {object_name: list(fields.values()) for object_name, fields in objects.items()}
+    logging.debug("Writing object definitions to file: %s", path)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            if cache_format == 'yaml':
+                _get_yaml().dump(data, f, Dumper=_Dumper, default_flow_style=False, sort_keys=False)
+            else:
+                json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _parse_one(path):
+    """
+    Parses a single cached object definition file, JSON or YAML depending on its extension.
+
+    Defined at module level so it can be dispatched to a process pool.
+
+    Args:
+        path (str): Path to the cached file.
+
+    Returns:
+        tuple: (object_name, fields) where fields is a dict of field names and their
+            definitions, or None if the file could not be parsed.
+    """
+    object_name, extension = os.path.splitext(os.path.basename(path))
+    try:
+        if extension == '.json':
+            with open(path, 'rb') as f:
+                fields = json.loads(f.read())
+        else:
+            with open(path, 'r') as f:
+                fields = _get_yaml().load(f, Loader=_Loader)
+        if isinstance(fields, list):
+            return object_name, {field['name']: field for field in fields if 'name' in field}
+    except Exception as e:
+        logging.error(f"Error loading cached definition for {object_name} from {path}: {e}")
+    return object_name, None
+
+
+class _BinaryCache:
+    """
+    Memory-mapped binary cache of object definitions. The file holds an 8-byte header length,
+    a pickled header ({'complete': bool, 'index': {object_name: (offset, length)}}) and then one
+    pickle per object, so each object is only read and unpickled when it is first needed and
+    unused pages never leave the page cache.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.mtime = os.fstat(f.fileno()).st_mtime
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header_length = struct.unpack_from('<Q', self._mm, 0)[0]
+        header = pickle.loads(self._mm[8:8 + header_length])
+        self.complete = header['complete']
+        self.index = header['index']
+        self._data_offset = 8 + header_length
+
+    def __contains__(self, object_name):
+        return object_name in self.index
+
+    def covers(self, names):
+        """
+        Whether the cache holds every object in names, or every object in the org if names is None.
+        """
+        return self.complete if names is None else names.issubset(self.index)
+
+    def raw(self, object_name):
+        offset, length = self.index[object_name]
+        start = self._data_offset + offset
+        return self._mm[start:start + length]
+
+    def load(self, object_name):
+        return pickle.loads(self.raw(object_name))
+
+    @staticmethod
+    def write(path, objects, complete, base=None):
+        """
+        Atomically writes object definitions in the format read by _BinaryCache, keeping the
+        entries of base that are not in objects. A merged file keeps base's mtime so the
+        entries carried over do not outlive their ttl.
+        """
+        blobs = {}
+        if base is not None:
+            blobs.update((object_name, base.raw(object_name)) for object_name in base.index
+                         if object_name not in objects)
+            complete = complete or base.complete
+        blobs.update((object_name, pickle.dumps(fields, protocol=5)) for object_name, fields in objects.items())
+
+        index = {}
+        offset = 0
+        for object_name, blob in blobs.items():
+            index[object_name] = (offset, len(blob))
+            offset += len(blob)
+        header = pickle.dumps({'complete': complete, 'index': index}, protocol=5)
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(struct.pack('<Q', len(header)))
+                f.write(header)
+                f.writelines(blobs.values())
+            if base is not None and len(blobs) > len(objects):
+                os.utime(tmp_path, (base.mtime, base.mtime))
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+
+def _binary_cache_path(cache_folder):
+    """
+    Returns the path of the binary cache for a definitions folder, or for the org configured
+    in the environment when no folder is given so that different orgs never share a cache.
+    Either way it lives under DEFAULT_CACHE_FOLDER, keyed by a hash of the folder's absolute
+    path or of the org, so pickles are never written to or read from the definitions folder.
+    """
+    if cache_folder:
+        source = f"folder|{os.path.abspath(cache_folder)}"
+    else:
+        source = f"{os.environ.get('SALESFORCE_TOKEN_URL')}|{os.environ.get('CONSUMER_KEY')}"
+    key = hashlib.sha256(source.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(os.path.expanduser(DEFAULT_CACHE_FOLDER), key, BINARY_CACHE_NAME)
+
+
+def _source_mtime(cache_folder):
+    """
+    Returns the newest mtime of the definition files in a cache folder, 0 if there are none.
+    """
+    extensions = tuple(CACHE_FORMATS.values())
+    try:
+        with os.scandir(cache_folder) as entries:
+            return max((entry.stat().st_mtime for entry in entries if entry.name.endswith(extensions)), default=0)
+    except OSError:
+        return 0
+
+
+def _open_binary_cache(cache_path, ttl, not_before=0):
+    """
+    Opens the binary cache if it is fresh.
+
+    Args:
+        cache_path (str): Path to the binary cache file.
+        ttl (int): Maximum age of the cache file in seconds.
+        not_before (float, optional): mtime of the files the cache was built from; an older
+            cache is stale. Defaults to 0.
+
+    Returns:
+        _BinaryCache or None: The cache, or None if it is missing or stale.
+    """
+    try:
+        mtime = os.path.getmtime(cache_path)
+    except OSError:
+        return None
+    age = time.time() - mtime
+    if age >= ttl:
+        logging.debug(f"Object definition cache {cache_path} is stale ({age:.0f}s old)")
+        return None
+    if mtime <= not_before:
+        logging.debug(f"Object definition cache {cache_path} is older than its source files")
+        return None
+
+    try:
+        return _BinaryCache(cache_path)
+    except Exception as e:
+        logging.warning(f"Error reading object definition cache {cache_path}: {e}")
+        return None
+
+
+def _write_binary_cache(cache_path, objects, complete, base=None):
     """
-    Loads Salesforce object definitions either from Salesforce API or from cached YAML files.
+    Writes object definitions to the binary cache, logging rather than raising on failure.
+
+    Args:
+        cache_path (str): Path to the binary cache file.
+        objects (dict): Object definitions to cache.
+        complete (bool): Whether the definitions cover every object in the org.
+        base (_BinaryCache, optional): Fresh existing cache whose other entries are kept.
+            Defaults to None.
+    """
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        _BinaryCache.write(cache_path, objects, complete, base)
+        logging.debug(f"Wrote object definition cache {cache_path}")
+    except Exception as e:
+        logging.warning(f"Error writing object definition cache {cache_path}: {e}")
+
+
+def _load_definition_files(cache_folder, names, cache_format):
+    """
+    Loads a cache folder holding one definition file per object, in parallel.
+
+    Args:
+        cache_folder (str): Path to the folder containing the files.
+        names (frozenset): Object API names to load, or None to load every file.
+        cache_format (str): Format of the files, falling back to YAML if there are none.
+
+    Returns:
+        dict: Object names mapped to dicts of field names and their definitions.
+    """
+    import glob
+
+    # fall back to YAML files written before JSON was supported
+    cache_files = glob.glob(os.path.join(cache_folder, f"*{CACHE_FORMATS[cache_format]}"))
+    if not cache_files and cache_format != 'yaml':
+        cache_files = glob.glob(os.path.join(cache_folder, '*.yaml'))
+    # the consolidated files are read by _read_definitions, not as an object named 'objects'
+    cache_files = [cache_file for cache_file in cache_files
+                   if os.path.splitext(os.path.basename(cache_file))[0] != CONSOLIDATED_CACHE_NAME]
+    if names is not None:
+        cache_files = [cache_file for cache_file in cache_files
+                       if os.path.splitext(os.path.basename(cache_file))[0] in names]
+
+    # JSON and the C YAML loader parse cheaply enough that threads beat the cost of spawning
+    # processes; the pure-Python YAML loader needs processes to sidestep the GIL
+    has_yaml = any(cache_file.endswith('.yaml') for cache_file in cache_files)
+    if has_yaml:
+        _get_yaml()
+    parse_in_threads = _LIBYAML or not has_yaml
+    executor_class = concurrent.futures.ThreadPoolExecutor if parse_in_threads else concurrent.futures.ProcessPoolExecutor
+    with executor_class(max_workers=os.cpu_count()) as executor:
+        results = list(executor.map(_parse_one, cache_files))
+
+    loaded = {}
+    for object_name, fields in results:
+        if fields is not None:
+            loaded[object_name] = fields
+            logging.debug(f"Loaded cached definition for {object_name} with {len(fields)} fields")
+    return loaded
+
+
+def load_object_definitions(names=None, cache_folder=None, output=None, ttl=CACHE_TTL, force_refresh=False,
+                            cache_format='json'):
+    """
+    Loads Salesforce object definitions either from Salesforce API or from cached JSON/YAML files.
     
     This function populates the global object_definitions dictionary with field metadata
     for specified Salesforce objects. It can either retrieve fresh data from Salesforce
-    or load from previously cached YAML files for faster access.
+    or load from previously cached files for faster access. Objects that are not loaded
+    here are described on first use, see preload_all to describe everything up front.
+
+    Definitions are saved to and loaded from a single objects.json (or objects.yaml) file.
+    Cache folders holding one file per object, as written by earlier versions, are still read.
+
+    Whatever is loaded is also merged into a binary cache file (cache.pkl in a folder under
+    DEFAULT_CACHE_FOLDER keyed by cache_folder, or by the org when no cache_folder is given). While
+    that file is younger than ttl seconds, newer than the files in cache_folder and holds the
+    requested objects it is used instead, skipping both the Salesforce describe calls and the
+    parsing of the cached files. When every object is requested the file is memory-mapped and
+    each object is only unpickled on first use.
     
     Args:
         names (list, optional): List of specific object API names to load. If empty or None,
-            loads all available objects from Salesforce. Defaults to [].
-        cache_folder (str, optional): Path to folder containing cached YAML files. If None,
+            loads every object in cache_folder. Without a cache_folder nothing is described:
+            the org's binary cache is attached if fresh and every object is described lazily
+            on first use. Defaults to None.
+        cache_folder (str, optional): Path to folder containing cached definition files. If None,
             retrieves fresh data from Salesforce API. If provided, loads from cached files
-            instead. Defaults to None.
-        output (str, optional): Path to folder where object definitions should be saved as
-            YAML files. If None, no files are written. Defaults to None.
+            instead, falling back to YAML files if the folder has none in cache_format.
+            Defaults to None.
+        output (str, optional): Path to folder where the named object definitions should be
+            saved. They are merged into any definitions already saved there. Use preload_all
+            to save every object. If None, no files are written. Defaults to None.
+        ttl (int, optional): Maximum age in seconds of the binary cache before it is
+            considered stale. Defaults to CACHE_TTL.
+        force_refresh (bool, optional): Ignore the binary cache and reload the definitions.
+            Defaults to False.
+        cache_format (str, optional): Format of the files written to output and read from
+            cache_folder, 'json' or 'yaml'. Defaults to 'json'.
     
     Returns:
         None: This function modifies the global object_definitions dictionary in-place.
     
     Examples:
-        # Load all objects from Salesforce and cache to files
-        load_object_definitions(output='./cache')
+        # Load specific objects from Salesforce and cache to files
+        load_object_definitions(['Account', 'Contact'], output='./cache')
         
         # Load specific objects from Salesforce
         load_object_definitions(['Account', 'Contact'])
@@ -143,56 +683,101 @@ def load_object_definitions(names=[], cache_folder=None, output=None):
         
         # Load specific objects from cache
         load_object_definitions(['Account'], cache_folder='./cache')
+
+        # Ignore the binary cache and describe the objects again
+        load_object_definitions(['Account'], force_refresh=True)
     """
-    global object_definitions
+    # an empty list means every object, like None
+    names_set = frozenset(names) if names else None
+
+    if names_set is None and cache_folder is None:
+        if output:
+            logging.error("Saving every object definition requires describing the whole org, use preload_all")
+            return
+        # objects are described lazily, but a fresh cache saves those describes too
+        cache = None if force_refresh else _open_binary_cache(_binary_cache_path(None), ttl)
+        if cache is not None:
+            object_definitions.attach_cache(cache)
+            _clear_definition_caches()
+        return
+
+    _load_definitions(names_set, cache_folder, output, ttl, force_refresh, cache_format)
+
+
+def _load_definitions(names_set, cache_folder, output, ttl, force_refresh, cache_format):
+    """
+    Loads object definitions as described by load_object_definitions, with names_set None
+    meaning every object; without a cache_folder that describes the whole org.
+    """
+    if cache_format not in CACHE_FORMATS:
+        logging.error(f"Unsupported cache format '{cache_format}', expected one of {', '.join(CACHE_FORMATS)}")
+        return
 
-    object_names = names if names else get_all_objects()
+    cache_path = _binary_cache_path(cache_folder)
+    cache = _open_binary_cache(cache_path, ttl, _source_mtime(cache_folder) if cache_folder else 0)
+
+    # writing output files always needs a fresh describe
+    if cache is not None and cache.covers(names_set) and not force_refresh and not output:
+        if names_set is None:
+            object_definitions.attach_cache(cache)
+        else:
+            object_definitions.update({object_name: cache.load(object_name) for object_name in names_set})
+        _clear_definition_caches()
+        logging.debug(f"Loaded {len(names_set or cache.index)} object definitions from {cache_path}")
+        return
 
+    loaded = {}
     if cache_folder is None:
-        # retrieve from Salesforce
-        for object_name in object_names:
-            obj_desc = describe_object(object_name)
-            if not obj_desc:
-                logging.error(f"Object '{object_name}' not found or description failed.")
-                continue
+        # retrieve from Salesforce, authenticating up front so the workers share one client
+        object_names = names_set if names_set is not None else get_all_objects()
+        get_client()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=DESCRIBE_WORKERS) as executor:
+            results = list(executor.map(_process_object, object_names))
+
+        loaded = {object_name: fields for object_name, fields in results if fields is not None}
 
-            fields = []
-            for f in obj_desc.get('fields', []):
-                field_info = {
-                    'name': f.get('name'),
-                    'label': f.get('label'),
-                    'type': f.get('type'),
-                    'reference': f.get('referenceTo', [])[0] if f.get('referenceTo') else None,
-                    'length': f.get('length'),
-                    'picklistValues': [pv['value'] for pv in f.get('picklistValues', [])]
-                }
-                fields.append(field_info)
-
-            logging.debug(f"loaded object definition for {object_name} with {len(fields)} fields")
-            object_definitions[object_name] = {field['name']: field for field in fields if 'name' in field}
-
-            if output:
-                os.makedirs(output, exist_ok=True)
-                output_file = os.path.join(output, f"{object_name}.yaml")
-                logging.debug("Writing object definition to YAML file: %s", output_file)
-                with open(output_file, 'w') as f:
-                    yaml.dump(fields, f, default_flow_style=False, sort_keys=False)
+        if output:
+            os.makedirs(output, exist_ok=True)
+            _write_definitions(os.path.join(output, f"{CONSOLIDATED_CACHE_NAME}{CACHE_FORMATS[cache_format]}"),
+                               loaded, cache_format)
 
     else:
-        # load from cache folder
-        yaml_files = glob.glob(os.path.join(cache_folder, '*.yaml'))
-        for yaml_file in yaml_files:
-            object_name = os.path.splitext(os.path.basename(yaml_file))[0]
-            if names is not None and object_name not in names:
-                continue
+        consolidated_files = [os.path.join(cache_folder, f"{CONSOLIDATED_CACHE_NAME}{extension}")
+                              for extension in (CACHE_FORMATS[cache_format], '.yaml')]
+        consolidated_file = next((path for path in consolidated_files if os.path.exists(path)), None)
+        if consolidated_file:
             try:
-                with open(yaml_file, 'r') as f:
-                    fields = yaml.safe_load(f)
-                    if isinstance(fields, list):
-                        object_definitions[object_name] = {field['name']: field for field in fields if 'name' in field}
-                        logging.debug(f"Loaded cached definition for {object_name} with {len(fields)} fields")
+                loaded = _read_definitions(consolidated_file)
             except Exception as e:
-                logging.error(f"Error loading cached YAML for {object_name}: {e}")
+                logging.error(f"Error loading cached definitions from {consolidated_file}: {e}")
+            if names_set is not None:
+                loaded = {object_name: fields for object_name, fields in loaded.items() if object_name in names_set}
+            logging.debug(f"Loaded {len(loaded)} cached definitions from {consolidated_file}")
+        else:
+            loaded = _load_definition_files(cache_folder, names_set, cache_format)
+
+    object_definitions.update(loaded)
+    _clear_definition_caches()
+    if loaded:
+        _write_binary_cache(cache_path, loaded, complete=names_set is None, base=cache)
+
+
+def preload_all(cache_folder=None, output=None, ttl=CACHE_TTL, force_refresh=False, cache_format='json'):
+    """
+    Loads the definitions of every Salesforce object up front, describing them in parallel.
+
+    Objects are otherwise described lazily the first time they are used, so this is only
+    needed by callers that want every definition, e.g. to write a complete cache.
+
+    Args:
+        cache_folder (str, optional): Load from cached files instead of Salesforce, see
+            load_object_definitions. Defaults to None.
+        output (str, optional): Folder to save the definitions to. Defaults to None.
+        ttl (int, optional): Maximum age in seconds of the binary cache. Defaults to CACHE_TTL.
+        force_refresh (bool, optional): Ignore the binary cache. Defaults to False.
+        cache_format (str, optional): 'json' or 'yaml'. Defaults to 'json'.
+    """
+    _load_definitions(None, cache_folder, output, ttl, force_refresh, cache_format)
 
 
 def get_object_fields(name):
@@ -206,17 +791,51 @@ def get_object_fields(name):
     Returns:
         dict: A dictionary of field names and their definitions.
     """
-    if not object_definitions:
-        logging.error("Object definitions not loaded. Call load_object_field_definitions first.")
-        return None
-
-    if name in object_definitions:
+    try:
         return object_definitions[name]
-    else:
-        logging.error(f"Object '{name}' not found in loaded definitions.")
+    except KeyError:
+        logging.error(f"Object '{name}' not found in loaded definitions or Salesforce.")
         return None
 
 
+def _create_batch(object_name, batch):
+    """
+    Creates up to COMPOSITE_BATCH_SIZE records in one sObject Collections request.
+
+    Returns:
+        list: One result dict ({'id', 'success', 'errors'}) per record, in order.
+    """
+    records = [{'attributes': {'type': object_name}, **data} for data in batch]
+    return get_client().restful('composite/sobjects', method='POST',
+                                json={'allOrNone': False, 'records': records})
+
+
+def create_objects(object_name, data_list):
+    """
+    Creates Salesforce object records in batches of COMPOSITE_BATCH_SIZE per request.
+    Args:
+        object_name (str): The API name of the Salesforce object.
+        data_list (list): The data to create each record with.
+    Returns:
+        list: One result per record, in the order of data_list. Each is the Salesforce result
+            dict ({'id', 'success', 'errors'}), or None if its batch failed to send.
+    """
+    results = []
+    for batch in split_into_batches(data_list, COMPOSITE_BATCH_SIZE):
+        try:
+            results += _create_batch(object_name, batch)
+        except Exception as e:
+            logging.error(f"Error creating batch of {len(batch)} {object_name} records: {e}")
+            results += [None] * len(batch)
+
+    for result in results:
+        if result and not result.get('success'):
+            logging.error(f"Error creating {object_name}: {result.get('errors')}")
+    created = sum(1 for result in results if result and result.get('success'))
+    logging.info(f"Created {created} of {len(results)} {object_name} records")
+    return results
+
+
 def create_object(object_name, data):
     """
     Creates a new Salesforce object record using the provided data.
@@ -227,8 +846,10 @@ def create_object(object_name, data):
         dict: The created object record.
     """
     try:
-        svc = get_client()
-        result = svc.__getattr__(object_name).create(data)
+        result = _create_batch(object_name, [data])[0]
+        if not result.get('success'):
+            logging.error(f"Error creating {object_name}: {result.get('errors')}")
+            return None
         logging.info(f"Created {object_name} with Id: {result['id']}")
         return result
     except Exception as e:
@@ -247,14 +868,12 @@ def update_object(object_name, object_id, data):
         dict: The update result (usually contains updated count).
     """
     try:
-        svc = get_client()
-        
         # Remove Id field from data if present (Salesforce doesn't allow updating the Id field)
         update_data = data.copy()
         if 'Id' in update_data:
             del update_data['Id']
             
-        result = svc.__getattr__(object_name).update(object_id, update_data)
+        result = _get_sobject(object_name).update(object_id, update_data)
         logging.info(f"Updated {object_name} with Id: {object_id}")
         return result
     except Exception as e:
@@ -269,8 +888,7 @@ def delete_object(object_name, object_id):
         object_name (str): The API name of the Salesforce object.
         object_id (str): The Id of the object record to delete."""
     try:
-        svc = get_client()
-        result = svc.__getattr__(object_name).delete(object_id)
+        result = _get_sobject(object_name).delete(object_id)
         logging.info(f"Deleted {object_name} with Id: {object_id}")
         return result
     except Exception as e:
@@ -278,37 +896,181 @@ def delete_object(object_name, object_id):
         return None
 
 
-def get_object(object_name, where=None):
+def _relationship_name(field_info):
+    """
+    Returns the SOQL relationship name for a reference field, e.g. 'Account' for 'AccountId'
+    or 'Parent__r' for 'Parent__c'. Definitions cached before relationship names were recorded
+    fall back to Salesforce's naming convention.
+    """
+    if field_info.get('relationship'):
+        return field_info['relationship']
+    field_name = field_info['name']
+    if field_name.endswith('__c'):
+        return field_name[:-3] + '__r'
+    if field_name.endswith('Id'):
+        return field_name[:-2]
+    return None
+
+
+def _default_field_names(object_name, fields):
+    """
+    Returns the fields selected for an object when none are given: default_fields[object_name]
+    with Id added if missing, since callers such as resolve_references key records by Id, or
+    every field in fields when no defaults are set.
+    """
+    defaults = default_fields.get(object_name)
+    if not defaults:
+        return list(fields)
+    return defaults if 'Id' in defaults else ['Id', *defaults]
+
+
+def _unique_fields(field_names):
+    """
+    Returns field_names without duplicates, which SOQL rejects, comparing names
+    case-insensitively as SOQL does and keeping the first occurrence.
+    """
+    seen = set()
+    return [field_name for field_name in field_names
+            if not (field_name.lower() in seen or seen.add(field_name.lower()))]
+
+
+def _relationship_fields(object_name, depth, field_names=None):
+    """
+    Builds the SOQL field list for an object including the fields of its referenced parents,
+    following references up to depth levels, nearest parents first. Only references in
+    field_names are followed when it is given. Parent definitions are loaded on demand.
+    Polymorphic references, parents that cannot be loaded and objects already on the path are
+    skipped, and parents stop being added once the query would exceed MAX_RELATIONSHIPS or
+    MAX_SELECT_LENGTH.
+    """
+    try:
+        fields = object_definitions[object_name]
+    except KeyError:
+        return []
+    if field_names is None:
+        field_names = _default_field_names(object_name, fields)
+    field_list = _unique_fields(field_names)
+    selected = {field_name.lower() for field_name in field_list}
+    relationships = 0
+    length = len(', '.join(field_list))
+
+    pending = collections.deque([(fields, field_names, depth, '', (object_name,))])
+    while pending:
+        fields, field_names, depth, prefix, path = pending.popleft()
+        for field_name in field_names:
+            field_info = fields.get(field_name)
+            if not field_info or not field_info.get('reference') or field_info.get('polymorphic'):
+                continue
+            parent_name = field_info['reference']
+            relationship = _relationship_name(field_info)
+            if not relationship or parent_name in path:
+                continue
+            try:
+                parent_fields = object_definitions[parent_name]
+            except KeyError:
+                logging.warning(f"Skipping reference '{prefix}{field_name}' of '{object_name}': "
+                                f"definition for '{parent_name}' could not be loaded")
+                continue
+
+            parent_prefix = f"{prefix}{relationship}."
+            parent_field_names = _default_field_names(parent_name, parent_fields)
+            parent_list = [f"{parent_prefix}{parent_field_name}" for parent_field_name in parent_field_names
+                           if f"{parent_prefix}{parent_field_name}".lower() not in selected]
+            parent_length = len(', '.join(parent_list)) + 2
+            if relationships >= MAX_RELATIONSHIPS or length + parent_length > MAX_SELECT_LENGTH:
+                logging.warning(f"Relationship query for '{object_name}' truncated at {relationships} "
+                                f"parent relationships to stay within SOQL limits")
+                return field_list
+
+            field_list += parent_list
+            selected.update(field_name.lower() for field_name in parent_list)
+            relationships += 1
+            length += parent_length
+            if depth > 1:
+                pending.append((parent_fields, parent_field_names, depth - 1, parent_prefix,
+                                path + (parent_name,)))
+    return field_list
+
+
+def _build_select(object_name, fields, depth):
+    """
+    Builds the 'SELECT ... FROM object' part of a query, following references depth levels.
+    """
+    if depth:
+        field_list = ', '.join(_relationship_fields(object_name, depth, field_names=fields))
+    else:
+        field_list = ', '.join(_unique_fields(fields))
+    return f"SELECT {field_list} FROM {object_name}"
+
+
+def get_object(object_name, where=None, resolve_refs=False, fields=None, stream=False):
     """
     Query Salesforce for objects by API name, using fields from the loaded YAML definitions.
     Args:
         object_name (str): The API name of the Salesforce object.
         where (str, optional): The WHERE clause (without 'WHERE').
+        resolve_refs (bool or int, optional): Also select the fields of referenced parent objects
+            using SOQL relationship queries, so each parent is returned as a nested dict under its
+            relationship name (e.g. 'Account', 'Parent__r') in the same round trip. An int follows
+            references that many levels deep, capped at MAX_RELATIONSHIP_DEPTH. Parent definitions
+            are loaded on demand; parents that cannot be loaded are skipped. Defaults to False.
+        fields (list, optional): The fields to select. Relationship paths such as 'Account.Name'
+            are passed through, plain field names must exist in the loaded definitions (compared
+            case-insensitively, like SOQL). Duplicates are selected once. If None,
+            selects default_fields[object_name] (plus Id) when set, otherwise every loaded field.
+        stream (bool, optional): Return an iterator that fetches records batch by batch instead
+            of a list. Errors are raised while iterating, see run_soql_query_iter. Defaults to False.
     Returns:
-        list: List of object records (dicts).
+        list or iterator: List of object records (dicts), or an iterator over them if stream is set.
     """
-    fields = get_object_fields(object_name)
-    if not fields:
+    object_fields = get_object_fields(object_name)
+    if not object_fields:
         logging.error(f"fields for object '{object_name}' not found.")
         return []
-    field_list = ', '.join(fields.keys())
-    query = f"SELECT {field_list} FROM {object_name}"
+    depth = max(0, min(int(resolve_refs), MAX_RELATIONSHIP_DEPTH))
+    if fields is None:
+        defaults = default_fields.get(object_name)
+        if depth:
+            # relationship queries also depend on the parents' definitions so are not cached
+            query = _build_select(object_name, _default_field_names(object_name, object_fields), depth)
+        else:
+            key = (object_name, tuple(defaults) if defaults else None)
+            query = _select_prefix.get(key)
+            if query is None:
+                query = _select_prefix[key] = _build_select(
+                    object_name, _default_field_names(object_name, object_fields), depth)
+    elif not fields:
+        logging.error(f"no fields given for object '{object_name}'.")
+        return []
+    else:
+        # SOQL field names are case-insensitive
+        known = {field_name.lower() for field_name in object_fields}
+        unknown = [field for field in fields if '.' not in field and field.lower() not in known]
+        if unknown:
+            logging.error(f"unknown fields for object '{object_name}': {', '.join(unknown)}")
+            return []
+        query = _build_select(object_name, fields, depth)
     if where:
         query += f" WHERE {where}"
+    if stream:
+        return run_soql_query_iter(query)
     results = run_soql_query(query)
     return results if results else []
 
 
-def get_object_by_id(object_name, id):
+def get_object_by_id(object_name, id, resolve_refs=False, fields=None):
     """
     Query Salesforce for a single object by its API name and Id, using fields from the loaded YAML definitions.
     Args:
         object_name (str): The API name of the Salesforce object.
         id (str): The Salesforce Id to filter by.
+        resolve_refs (bool or int, optional): Include referenced parent objects, see get_object.
+            Defaults to False.
+        fields (list, optional): The fields to select, see get_object. Defaults to None.
     Returns:
         dict or None: The object record if found, else None.
     """
-    results = get_object(object_name, where=f"Id = '{id}'")
+    results = get_object(object_name, where=f"Id = '{id}'", resolve_refs=resolve_refs, fields=fields)
     if results and len(results) > 0:
         return results[0]
     return None
@@ -324,39 +1086,68 @@ def get_object_references(object_name):
     Returns:
         list: A list of reference field names.
     """
-    fields = get_object_fields(object_name)
-    if not fields:
+    try:
+        return _references_for(object_name)
+    except KeyError:
         logging.error(f"Fields for object '{object_name}' not found.")
         return []
 
-    references = {field['name']: field for field in fields.values() if field.get('reference')}
-    return references
+
+@functools.lru_cache(maxsize=None)
+def _references_for(object_name):
+    # cleared whenever object_definitions is reloaded; misses raise so they are not cached
+    fields = get_object_fields(object_name)
+    if not fields:
+        raise KeyError(object_name)
+    return {field['name']: field for field in fields.values() if field.get('reference')}
 
 
 def resolve_references(obj, object_name, refs=None):
     """
-    Resolves reference fields in a Salesforce object dict, replacing reference ids with the referenced object dicts.
+    Resolves reference fields in Salesforce object dicts, adding each referenced object dict under its
+    relationship name (e.g. 'Account' for AccountId, 'Parent__r' for Parent__c) as get_object(resolve_refs=True) does.
+    Referenced records are fetched with one query per referenced object type (in batches of
+    REFERENCE_BATCH_SIZE ids) rather than one query per reference.
     Args:
-        obj (dict): The object record to resolve references for.
+        obj (dict or list): The object record, or list of records, to resolve references for.
         object_name (str): The API name of the Salesforce object.
         refs (list, optional): List of reference field names to resolve. If None, resolve all references.
     Returns:
-        dict: The object with references resolved (in-place).
+        dict or list: The object(s) with references resolved (in-place).
     """
     reference_fields = get_object_references(object_name)
     if not reference_fields:
         logging.error(f"no reference fields found for object '{object_name}'.")
         return obj
-    for field_name, field_info in reference_fields.items():
-        if obj.get(field_name):
-            if refs is not None and field_name not in refs:
-                continue
-            ref_obj_name = field_info['reference']
-            ref_id = obj[field_name]
-            ref_data = get_object_by_id(ref_obj_name, ref_id)
+    if refs is not None:
+        reference_fields = {name: info for name, info in reference_fields.items() if name in refs}
+
+    records = obj if isinstance(obj, list) else [obj]
+
+    # collect the referenced ids grouped by the object type they point at
+    ids_by_object = {}
+    for record in records:
+        for field_name, field_info in reference_fields.items():
+            ref_id = record.get(field_name)
+            if ref_id:
+                ids_by_object.setdefault(field_info['reference'], set()).add(ref_id)
+
+    # fetch each referenced object type in as few queries as possible
+    lookup = {}
+    for ref_obj_name, ids in ids_by_object.items():
+        for batch in split_into_batches(ids, REFERENCE_BATCH_SIZE):
+            where = 'Id IN (' + ','.join(f"'{ref_id}'" for ref_id in batch) + ')'
+            for ref_data in get_object(ref_obj_name, where=where):
+                lookup[ref_data['Id']] = ref_data
+
+    # key parents by relationship name ('Account' for AccountId), as relationship queries do
+    resolved_keys = {field_name: _relationship_name(field_info) or field_name
+                     for field_name, field_info in reference_fields.items()}
+    for record in records:
+        for field_name, resolved_key in resolved_keys.items():
+            ref_data = lookup.get(record.get(field_name))
             if ref_data:
-                resolved_key = field_name.replace('__c', '__r')
-                obj[resolved_key] = ref_data
+                record[resolved_key] = ref_data
     return obj
 
 
@@ -370,21 +1161,29 @@ def pretty_print_object(obj, object_name, indent=0):
         object_name (str): The API name of the Salesforce object.
         indent (int, optional): Number of spaces to indent each line. Defaults to 0.
     """
-    fields = get_object_fields(object_name)
-    if not fields:
+    try:
+        sorted_fields = _sorted_fields(object_name)
+    except KeyError:
         logging.error(f"fields for object '{object_name}' not found.")
         return
     prefix = ' ' * indent
     print(f"{prefix}---- Object: {object_name} ----")
-    # Sort fields by label (fallback to field name if label missing)
-    sorted_fields = sorted(fields.values(), key=lambda f: f.get('label', f['name']))
-    for field_info in sorted_fields:
-        field_name = field_info['name']
-        label = field_info.get('label', field_name)
+    for field_name, label in sorted_fields:
         value = obj.get(field_name, None)
         print(f"{prefix}{label} ({field_name}): {value}")
 
 
+@functools.lru_cache(maxsize=None)
+def _sorted_fields(object_name):
+    # (field name, label) pairs sorted by label, falling back to the field name if label missing;
+    # cleared whenever object_definitions is reloaded; misses raise so they are not cached
+    fields = get_object_fields(object_name)
+    if not fields:
+        raise KeyError(object_name)
+    labelled = ((field_info['name'], field_info.get('label') or field_info['name']) for field_info in fields.values())
+    return tuple(sorted(labelled, key=lambda field: field[1]))
+
+
 def upload_file(object_id, file_path):
     """
     Uploads a file to a Salesforce object.
@@ -404,14 +1203,18 @@ def upload_file(object_id, file_path):
         file_name = os.path.basename(file_path)
 
         import base64
+        # encode in blocks whose size is a multiple of 3 so they concatenate without padding
+        encoded_data = bytearray()
         with open(file_path, 'rb') as file_data:
-            encoded_data = str(base64.b64encode(file_data.read()))
-            response = svc.ContentVersion.create({
-                'Title': os.path.splitext(file_name)[0],  # Exclude the file extension
-                'PathOnClient': file_path,
-                'VersionData': encoded_data[2:-1],
-                'FirstPublishLocationId': object_id
-            })
+            for block in iter(lambda: file_data.read(UPLOAD_BLOCK_SIZE), b''):
+                encoded_data += base64.b64encode(block)
+
+        response = svc.ContentVersion.create({
+            'Title': os.path.splitext(file_name)[0],  # Exclude the file extension
+            'PathOnClient': file_path,
+            'VersionData': encoded_data.decode('ascii'),
+            'FirstPublishLocationId': object_id
+        })
 
         logging.info(f"File '{file_name}' uploaded successfully to object ID '{object_id}'.")
         return response
@@ -428,7 +1231,8 @@ def retrieve_associated_files(object_id, batch_size=1, output_directory='attachm
     # retrieve all the ContentDocumentLinks for content documents we're going to download
     logging.info("Querying to get Content Document Ids...")
 
-    content_document_links = get_object('ContentDocumentLink', where=f"LinkedEntityId = '{object_id}'")
+    content_document_links = get_object('ContentDocumentLink', where=f"LinkedEntityId = '{object_id}'",
+                                        fields=['Id', 'ContentDocumentId'])
     logging.info(f"Found {len(content_document_links)} total files")
 
     # Begin Downloads
@@ -452,7 +1256,8 @@ def fetch_files(content_document_links=None, output_directory=None,
 
         where = "IsLatest = True AND FileExtension != 'snote'"
         where = where + ' AND ContentDocumentId in (' + ",".join("'" + item[content_document_id_name] + "'" for item in batch) + ')'
-        content_version = get_object('ContentVersion', where=where)
+        content_version = get_object('ContentVersion', where=where,
+                                     fields=['Id', 'Title', 'FileExtension', 'VersionData'])
 
         logging.debug(f"ContentVersion query found {len(content_version)} results")
 
@@ -480,7 +1285,7 @@ def download_file(args):
     url = f"https://{sf.sf_instance}{record['VersionData']}"
 
     logging.debug(f"downloading from {url}")
-    response = requests.get(url, headers={"Authorization": "OAuth " + sf.session_id,
+    response = _get_session().get(url, headers={"Authorization": "OAuth " + sf.session_id,
                                           "Content-Type": "application/octet-stream"})
     if response.ok:
         # Save File